@@ -9,21 +9,39 @@ all-cause mortality in preceding years.
 __author__ = "Maciej Sieczka <msieczka@sieczka.org>"
 
 import argparse
+import os
 import sys
+import warnings
+import numpy as np
 import pandas as pd
+import matplotlib
 import matplotlib.pyplot as mpyplot
 import matplotlib.dates as mdates
 import matplotlib.ticker as mticker
 from datetime import date as ddate
-from datetime import datetime as ddatetime
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+import pyarrow as pa
+from pyarrow import parquet as pa_parquet
 
 
 if sys.version_info < (3, 9):
     print("Python 3.9+ is required to run this script.")
     sys.exit(1)
 
+# Charts are only ever saved to files, never shown. So no GUI backend is needed, with all its start-up overhead.
+matplotlib.use('Agg')
 
-def main(country, year, if_list_countries, if_interpolate):
+# Let the Agg renderer simplify line paths more aggressively, and draw them in chunks.
+mpyplot.rcParams['path.simplify_threshold'] = 1.0
+mpyplot.rcParams['agg.path.chunksize'] = 10000
+
+# With copy-on-write, a frame selected from another one can be written to without copying it upfront, and without
+# pandas warning about setting values on a copy. The data are only copied if, and when, they are actually modified.
+pd.set_option('mode.copy_on_write', True)
+
+
+def main(country, years, if_list_countries, if_interpolate, if_fast_png):
     morta_death_cols_bgd = ['deaths_2010_all_ages', 'deaths_2011_all_ages', 'deaths_2012_all_ages',
                             'deaths_2013_all_ages', 'deaths_2014_all_ages', 'deaths_2015_all_ages',
                             'deaths_2016_all_ages', 'deaths_2017_all_ages', 'deaths_2018_all_ages',
@@ -37,27 +55,108 @@ def main(country, year, if_list_countries, if_interpolate):
     covid_cols = ['location', 'date', 'new_cases_smoothed', 'new_tests_smoothed', 'new_deaths', 'stringency_index',
                   'people_vaccinated', 'people_fully_vaccinated', 'total_boosters', 'population']
 
-    df_covid = pd.read_csv("./owid-covid-data.csv", parse_dates=['date'], usecols=covid_cols).reindex(
-        columns=covid_cols)
+    # Country names repeat in thousands of rows. As a categorical, each is stored just once, rows compare by integer
+    # codes, and the set of countries is readily available as the categories.
+    # NOTE: The numeric columns stay in double precision. Populations, vaccination and test counts are way over 2^24,
+    # the largest whole number float32 holds exactly, and interpolated death counts would shift in their 3rd decimal.
+    # Either would change the CSV datasets written.
+    covid_dtypes = {'location': 'category'}
+    morta_dtypes = {'location': 'category'}
 
-    df_morta = pd.read_csv("./excess_mortality.csv", parse_dates=['date'], usecols=morta_cols).reindex(
-        columns=morta_cols)
+    # Charting a single country only needs its own rows, so only these are read. Listing, or charting all the
+    # countries, needs them all.
+    locations = None if if_list_countries or country == 'ALL' else [country]
 
-    common_countries = sorted(set(df_morta['location']) & set(df_covid['location']))
+    df_covid = read_csv_cached("./owid-covid-data.csv", covid_cols, covid_dtypes, locations)
+    df_morta = read_csv_cached("./excess_mortality.csv", morta_cols, morta_dtypes, locations)
+
+    common_countries = sorted(df_morta['location'].cat.categories.intersection(df_covid['location'].cat.categories))
 
     if if_list_countries:
         list_countries(common_countries)
 
     elif country == 'ALL':
-        for country in common_countries:
-            orchestrate(country, df_covid, df_morta, year, morta_death_cols_bgd, morta_death_cols_all, if_interpolate)
+        # Nothing to process, and no workers to start, if the datasets have no countries in common.
+        if not common_countries:
+            return
+
+        # Countries are processed in parallel, in separate worker processes. The input data are split by country just
+        # once, here, and each worker is only sent the small dataframes of the countries it processes, rather than all
+        # the data. Only the countries present in both datasets are processed, so only their rows are split and scanned.
+        df_covid = df_covid[df_covid['location'].isin(common_countries)]
+        df_morta = df_morta[df_morta['location'].isin(common_countries)]
+        covid_by_country = split_by_country(df_covid)
+        morta_by_country = split_by_country(df_morta)
+        morta_death_cols_bgd_notnull_by_country = get_cols_notnull_by_country(df_morta, morta_death_cols_bgd)
+
+        # Countries are handed out to workers in chunks of a few, to cut down on the inter-process communication.
+        # There's no point in starting more workers than there are chunks, as each creates its matplotlib figure, to
+        # reuse it for all the countries it gets.
+        chunksize = 4
+        max_workers = max(1, min(os.cpu_count() or 1, -(-len(common_countries) // chunksize)))
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(partial(orchestrate, years=years, morta_death_cols_bgd=morta_death_cols_bgd,
+                                      morta_death_cols_all=morta_death_cols_all, if_interpolate=if_interpolate,
+                                      if_fast_png=if_fast_png),
+                              common_countries, [covid_by_country[c] for c in common_countries],
+                              [morta_by_country[c] for c in common_countries],
+                              [morta_death_cols_bgd_notnull_by_country[c] for c in common_countries],
+                              chunksize=chunksize))
 
     elif country in common_countries:
-        orchestrate(country, df_covid, df_morta, year, morta_death_cols_bgd, morta_death_cols_all, if_interpolate)
+        # Only the data of that specific country have been read, so there's nothing more to select.
+        orchestrate(country, df_covid, df_morta,
+                    get_cols_notnull_by_country(df_morta, morta_death_cols_bgd)[country], years,
+                    morta_death_cols_bgd, morta_death_cols_all, if_interpolate, if_fast_png)
 
     else:
         print("Country '{}' is not present in both input datasets.\n".format(country))
-        list_countries(common_countries)
+
+        # Only the rows of the country asked for have been read. Read them all to list the countries there are.
+        main(country, years, True, if_interpolate, if_fast_png)
+
+
+# Parsing the large input CSVs takes most of the startup time. So the columns used are cached in a Parquet file next to
+# each CSV, and read from there on subsequent runs - as long as the CSV hasn't been updated since, and all the columns
+# needed are in the cache. If `locations` are given, only their rows are returned. From the cache, only these are read
+# in the first place, with the filter pushed down to the Parquet reader.
+def read_csv_cached(path_csv, cols, dtypes, locations=None):
+    path_cache = os.path.splitext(path_csv)[0] + '.parquet'
+    filters = [('location', 'in', locations)] if locations else None
+
+    # A cache with single precision columns in it is stale as well. Those were written by earlier versions of this
+    # script, and their values have lost digits.
+    if os.path.exists(path_cache) and os.path.getmtime(path_cache) >= os.path.getmtime(path_csv) and \
+            set(cols).issubset(pa_parquet.read_schema(path_cache).names) and \
+            pa.float32() not in pa_parquet.read_schema(path_cache).types:
+        # The dtypes are set again, in case the cache was written with other ones.
+        return pd.read_parquet(path_cache, engine='pyarrow', columns=cols, filters=filters).astype(dtypes)
+
+    # PyArrow's multithreaded CSV parser is several times faster than pandas' own on these large files.
+    df = pd.read_csv(path_csv, engine='pyarrow', parse_dates=['date'], usecols=cols, dtype=dtypes).reindex(columns=cols)
+
+    df.to_parquet(path_cache, engine='pyarrow', compression='zstd', index=False)
+
+    if locations:
+        df = df[df['location'].isin(locations)].reset_index(drop=True)
+
+    return df
+
+
+# Split the data into a dataframe per country in a single pass, rather than scanning all of it for each country.
+def split_by_country(df):
+    return {country: df_country.reset_index(drop=True)
+            for country, df_country in df.groupby('location', sort=False, observed=True)}
+
+
+# Find which of the columns have any data, for each country. All the countries are checked in a single pass over the
+# data, rather than scanning each column of each country separately.
+def get_cols_notnull_by_country(df, cols):
+    notnull = df[cols].notnull().groupby(df['location'], sort=False, observed=True).any()
+
+    return {country: [c for c, if_notnull in zip(cols, row) if if_notnull]
+            for country, row in zip(notnull.index, notnull.to_numpy())}
 
 
 def list_countries(common_countries):
@@ -77,154 +176,191 @@ def list_countries(common_countries):
 # one such week is appended. In case of 2015 (which has 53 weeks, but its death count data series is capped at week 52
 # anyway in excess_mortality.csv) death count for the missing 53rd week is interpolated linearly from 2015's 52nd week
 # and the 1st week of 2016.
-def orchestrate(country, df_covid, df_morta, year, morta_death_cols_bgd, morta_death_cols_all, if_interpolate):
+def orchestrate(country, df_covid_country, df_morta_country, morta_death_cols_bgd_notnull, years, morta_death_cols_bgd,
+                morta_death_cols_all, if_interpolate, if_fast_png):
 
-    # Select only the data of a specific country.
-    df_covid_country = df_covid[df_covid['location'] == country].copy().reset_index(drop=True)
-    df_morta_country = df_morta[df_morta['location'] == country].copy().reset_index(drop=True)
+    # Bail out early from the years in which there is no all-cause mortality data for the country (or just a single
+    # record, which wouldn't make a line), or from all of them if there is none in the preceding years, as there would
+    # be nothing to compare on the chart. Saves rendering it, which is the most expensive step. Years past the last one
+    # in excess_mortality.csv have no column in it at all.
+    years_to_chart = [year for year in years if morta_death_cols_bgd_notnull and
+                      'deaths_{}_all_ages'.format(str(year)) in df_morta_country.columns and
+                      df_morta_country['deaths_{}_all_ages'.format(str(year))].notnull().sum() >= 2]
 
-    morta_death_cols_bgd_notnull = [c for c in morta_death_cols_bgd if df_morta_country[c].notnull().any()]
-    morta_year_bgd_notnull_min = morta_death_cols_bgd_notnull[0].split('_')[1]
-    morta_year_bgd_notnull_max = morta_death_cols_bgd_notnull[-1].split('_')[1]
+    for year in years:
+        if year not in years_to_chart:
+            print("Skipping '{}' - not enough all-cause mortality data to chart for {}.".format(country, year))
 
-    if df_morta_country['time_unit'].nunique() == 1:
-        time_unit = df_morta_country['time_unit'].unique()[0]
+    if not years_to_chart:
+        return
 
-        # Create ISO-week date index, starting at the end (7 = Sunday) of the 1st week of a year, and ending at the end
-        # of the 1st week of the following year. So that there's a 1 week overlap between charts for subsequent years -
-        # (eg. a 2020 chart will also have the 1st week of 2021). By ISO specification December 28th is always in the
-        # last week of the year.
-        dates_weekly_one = [ddatetime.fromisocalendar(year=year, week=w, day=7).strftime('%Y-%m-%d')
-                            for w in range(1, ddate(year=year, month=12, day=28).isocalendar().week + 1)
-                            ] + [ddatetime.fromisocalendar(year=year + 1, week=1, day=7).strftime('%Y-%m-%d')]
+    morta_year_bgd_notnull_min = morta_death_cols_bgd_notnull[0].split('_')[1]
+    morta_year_bgd_notnull_max = morta_death_cols_bgd_notnull[-1].split('_')[1]
 
-        df_dates_weekly_one = pd.DataFrame(dates_weekly_one, columns=['date'], dtype='datetime64[ns]')
+    # A single scan of the column, both to check that the country's data are in a single time unit, and to get it.
+    time_units = df_morta_country['time_unit'].unique()
 
-        df_morta_country_all, df_morta_country_one = process_morta_df(df_morta_country, df_dates_weekly_one, time_unit,
-                                                                      morta_death_cols_all, country)
+    if len(time_units) == 1:
+        time_unit = time_units[0]
 
-        df_covid_country_all, df_covid_country_one = process_covid_df(df_covid_country, df_dates_weekly_one, time_unit,
-                                                                      if_interpolate)
+        # All-time weekly data of the country. These are the same for each year charted, so are only processed once.
+        df_morta_country_all = process_morta_df(df_morta_country, time_unit, morta_death_cols_all)
 
-        df_merge_country_one = merge_covid_morta_dfs(df_covid_country_one, df_morta_country_one, year,
-                                                     morta_death_cols_bgd)
+        df_covid_country_all = process_covid_df(df_covid_country, time_unit, if_interpolate)
 
         # Find the Y axis bottom and top value in all-time death counts for a given country; to have an identical Y axis
         # range on that country's charts in different years. For some countries the number of non-covid deaths in a
         # given year (e.g. Belgium in 2020) happens to be lower than the lowest number of deaths from all causes in
         # previous years. For some, it's higher than the highest number of deaths in previous years - probably due to
         # borked data, but anyway (e.g. Kyrgyzstan in 2020 - see https://github.com/owid/covid-19-data/issues/1550).
-        deaths_noncovid_all = df_morta_country_all.set_index('date')['deaths'].sub(
-            df_covid_country_all.set_index('date')['new_deaths'])
+        # The covid deaths are looked up at the all-cause mortality dates, on their date index, so that both are aligned
+        # and can be subtracted as plain arrays. Dates only one of them has would come out NaN anyway.
+        deaths_noncovid_all = df_morta_country_all['deaths'].to_numpy() - \
+            df_covid_country_all['new_deaths'].reindex(df_morta_country_all['date']).to_numpy()
+
+        # Both are reduced together, skipping NaNs. Due to `deaths_noncovid_all` being all NaN under certain conditions.
+        # E.g. Greenland didn't have any covid deaths until 2021-12-27, and its all-cause mortality ended in Sep 2021,
+        # as of excess_mortality.csv at d4dfef79a8. The all-cause deaths are never all NaN here, as there would be no
+        # years to chart then.
+        deaths_y_range = np.concatenate([df_morta_country_all['deaths'].to_numpy(), deaths_noncovid_all])
+
+        y_min = np.nanmin(deaths_y_range)
+        y_max = np.nanmax(deaths_y_range)
+
+        for year in years_to_chart:
+            dates_weekly_one = get_dates_weekly_one(year)
 
-        # This conditional is due to `deaths_noncovid_all` being all NaN under certain conditions. E.g. Greenland didn't
-        # have any covid deaths until 2021-12-27, and its all-cause mortality ended in Sep 2021, as of
-        # excess_mortality.csv at d4dfef79a8.
-        if deaths_noncovid_all.isnull().all():
-            y_min = df_morta_country_all['deaths'].min()
-            y_max = df_morta_country_all['deaths'].max()
-        else:
-            y_min = min(deaths_noncovid_all.min(), df_morta_country_all['deaths'].min())
-            y_max = max(deaths_noncovid_all.max(), df_morta_country_all['deaths'].max())
+            df_morta_country_one = select_morta_df_one(df_morta_country_all, dates_weekly_one, time_unit,
+                                                       morta_death_cols_all, country)
 
-        plot_weekly(df_merge_country_one, country, year, morta_year_bgd_notnull_min, morta_year_bgd_notnull_max,
-                    time_unit, y_min, y_max)
+            # Take only rows of the year being charted. Both are indexed on the same weekly dates, so a reindex does,
+            # with no need for a hash-join of a full merge.
+            df_covid_country_one = df_covid_country_all.reindex(dates_weekly_one)
 
+            df_merge_country_one = merge_covid_morta_dfs(df_covid_country_one, df_morta_country_one, year,
+                                                         morta_death_cols_bgd)
 
-def process_morta_df(df_morta_country, df_dates_weekly_one, time_unit, morta_death_cols_all, country):
+            plot_weekly(df_merge_country_one, country, year, morta_year_bgd_notnull_min, morta_year_bgd_notnull_max,
+                        time_unit, y_min, y_max, if_fast_png)
+
+
+# Weekly dates depend only on the years, not on the country. So they are created just once per process, and then reused
+# for all the countries processed, rather than re-created for each of them.
+#
+# Create ISO-week date index, starting at the end (7 = Sunday) of the 1st week of a year, and ending at the end of the
+# 1st week of the following year. So that there's a 1 week overlap between charts for subsequent years - (eg. a 2020
+# chart will also have the 1st week of 2021).
+@lru_cache(maxsize=None)
+def get_dates_weekly_one(year):
+    return pd.date_range(start=pd.Timestamp.fromisocalendar(year, 1, 7),
+                         end=pd.Timestamp.fromisocalendar(year + 1, 1, 7), freq='W', name='date')
+
+
+# Create ISO-week date index from the 1st week of morta_year_all_min, to the 4th week of the year following
+# morta_year_all_max - to make sure it covers len(dates_weekly_one) weeks (up to 54) starting at the 1st ISO week of
+# morta_year_all_max, which the weeks_idx gather in select_morta_df_one() depends on.
+# NOTE: pd.date_range(start=str(morta_year_all_min), end=str(morta_year_all_max+2), freq='W') would be wrong, as we need
+# to start at 1st ISO week, while e.g. pd.date_range(start='2010', end='2021', freq='W') returns '2010-01-03' as the 1st
+# week of 2010, whereas per ISO-week convention (see e.g. pd.date_range(start='2010', end='2011', freq='W')[0].
+# isocalendar()) it's actually the 53rd week of 2009. Hence the range is anchored at the Sunday of the 1st ISO week.
+@lru_cache(maxsize=None)
+def get_dates_weekly_all(morta_year_all_min, morta_year_all_max):
+    return pd.date_range(start=pd.Timestamp.fromisocalendar(morta_year_all_min, 1, 7),
+                         end=pd.Timestamp.fromisocalendar(morta_year_all_max + 1, 4, 7), freq='W')
+
+
+# Number of ISO weeks in a year - 52 or 53. The 28th of December always falls into the last ISO week of its year. Like
+# the weekly dates, it only depends on the year, so it's computed once per process.
+@lru_cache(maxsize=None)
+def get_weeks_count(year):
+    return ddate(year=year, month=12, day=28).isocalendar().week
+
+
+def process_morta_df(df_morta_country, time_unit, morta_death_cols_all):
     morta_year_all_min = int(morta_death_cols_all[0].split('_')[1])
     morta_year_all_max = int(morta_death_cols_all[-1].split('_')[1])
 
     # From morta_year_all_min to morta_year_all_max. So that there is data overlap at year boundaries (e.g. for
     # 2015 52 -> 53 weeks interpolation).
-    # NOTE: pd.date_range(start=str(morta_year_all_min), end=str(morta_year_all_max+2), freq='W') would be
-    # simpler, but we need to start at 1st ISO week, while e.g. pd.date_range(start='2010', end='2021', freq='W')
-    # returns '2010-01-03' as the 1st week of 2010, whereas per ISO-week convention (see e.g.
-    # pd.date_range(start='2010', end='2011', freq='W')[0].isocalendar()) it's actually the 53rd week of 2009.
-    dates_weekly_all = []
-    for y in range(morta_year_all_min, morta_year_all_max + 1):
-        for w in range(1, ddate(year=y, month=12, day=28).isocalendar().week + 1):
-            dates_weekly_all.append(ddatetime.fromisocalendar(year=y, week=w, day=7).strftime('%Y-%m-%d'))
-
-    # Append 1st 4 weeks of the following year, to make sure dates_weekly_all is long enough for
-    # df_dates_weekly_one_weeks_count later on.
-    for w in range(1, 5):
-        dates_weekly_all.append(
-            ddatetime.fromisocalendar(year=morta_year_all_max + 1, week=w, day=7).strftime('%Y-%m-%d'))
+    dates_weekly_all = get_dates_weekly_all(morta_year_all_min, morta_year_all_max)
 
     if time_unit == 'monthly':
         # From morta_year_all_min to morta_year_all_max. So that there is data overlap at year boundaries for
         # monthly -> weekly interpolation.
         dates_monthly_all = pd.date_range(start=str(morta_year_all_min), end=str(morta_year_all_max + 1), freq='M')
 
-        df_morta_country_all_monthly = pd.DataFrame(dates_monthly_all, columns=['date'], dtype='datetime64[ns]')
-
         # Merge all morta_death_cols_all into one.
-        df_morta_country_all_monthly['deaths'] = pd.concat(
+        deaths_monthly_all = pd.concat(
             [df_morta_country[c][0:12] for c in df_morta_country[morta_death_cols_all]],
             axis='rows', ignore_index=True)
 
-        # Up-sample and interpolate monthly mortality data to weekly so that it can be used with other weekly data.
-        df_morta_country_all_monthly = df_morta_country_all_monthly.set_index('date').resample(rule='W').first(). \
-            interpolate(limit_area='inside').reset_index()
-
-        # Align the up-sampled monthly->weekly all-cause mortality data with the weekly date index which fully
-        # encompasses morta_year_all_min up to morta_year_all_max.
-        df_dates_weekly_all = pd.DataFrame(dates_weekly_all, columns=['date'], dtype='datetime64[ns]')
-        df_morta_country_all = pd.merge(left=df_dates_weekly_all, right=df_morta_country_all_monthly, on='date',
-                                        how='left')
+        # Up-sample and interpolate monthly mortality data to weekly so that it can be used with other weekly data, on
+        # the weekly date index which fully encompasses morta_year_all_min up to morta_year_all_max.
+        df_morta_country_all = pd.DataFrame({'date': dates_weekly_all})
+        df_morta_country_all['deaths'] = monthly_to_weekly(dates_monthly_all, deaths_monthly_all,
+                                                           df_morta_country_all['date'])
 
     elif time_unit == 'weekly':
-        df_morta_country_all = pd.DataFrame(dates_weekly_all, columns=['date'], dtype='datetime64[ns]')
+        df_morta_country_all = pd.DataFrame({'date': dates_weekly_all})
 
         # Merge all morta_death_cols_all columns into one.
         # NOTE: Eg. pd.concat([df_morta_country[c].dropna() for c in df_morta_country[morta_death_cols_all]],
         # axis='rows', ignore_index=True) would be simpler, but column 'deaths_2015_all_ages' which should have 53
         # records has only 52, so we have to take NaN as ['deaths_2015_all_ages'][52] and interpolate it from its
         # neighbours.
-        deaths = []
-        for y in range(morta_year_all_min, morta_year_all_max + 1):
-            w = ddate(year=y, month=12, day=28).isocalendar().week
-            c = 'deaths_{}_all_ages'.format(str(y))
-            deaths = deaths + df_morta_country[c][0:w].to_list()
+        deaths = np.concatenate([df_morta_country['deaths_{}_all_ages'.format(str(y))].to_numpy()[0:get_weeks_count(y)]
+                                 for y in range(morta_year_all_min, morta_year_all_max + 1)])
 
-        df_morta_country_all = pd.concat([df_morta_country_all, pd.DataFrame(deaths, columns=['deaths'])],
-                                         axis='columns')
+        # As a Series, it gets aligned with df_morta_country_all's index, i.e. padded with NaN for the last few weeks.
+        df_morta_country_all['deaths'] = pd.Series(deaths)
 
         # Interpolate NaNs from nearest neighbours. One such record for sure is 2016-01-03 in all countries' data
         # (53rd week of 2015), but maybe some countries have more. So interpolating it all away, just in case.
-        df_morta_country_all['deaths'].interpolate(limit_area='inside', inplace=True)
+        df_morta_country_all['deaths'] = interpolate_inside(df_morta_country_all['deaths'])
+
+    return df_morta_country_all
+
+
+def select_morta_df_one(df_morta_country_all, dates_weekly_one, time_unit, morta_death_cols_all, country):
+    morta_year_all_min = int(morta_death_cols_all[0].split('_')[1])
+    morta_year_all_max = int(morta_death_cols_all[-1].split('_')[1])
 
     # Put df_morta_country back together the way we need it for further processing.
-    df_morta_country_one = df_dates_weekly_one.copy()
+    df_morta_country_one = pd.DataFrame({'date': dates_weekly_one})
     df_morta_country_one['location'] = country
     df_morta_country_one['time_unit'] = time_unit
     df_morta_country_one['time'] = df_morta_country_one['date'].dt.isocalendar().week
 
-    df_dates_weekly_one_weeks_count = len(df_dates_weekly_one)
-    for y in range(morta_year_all_min, morta_year_all_max + 1):
-        col = 'deaths_{}_all_ages'.format(str(y))
-        date_start = ddatetime.fromisocalendar(year=y, week=1, day=7).strftime('%Y-%m-%d')
-        date_range = pd.date_range(start=date_start, periods=df_dates_weekly_one_weeks_count, freq='W')
-        df_morta_country_one[col] = df_morta_country_all[df_morta_country_all['date'].isin(date_range)]['deaths']. \
-            to_list()
+    # The all-time weekly dates are sorted and evenly spaced, so the weeks of each year are a contiguous slice of them,
+    # starting at the year's 1st ISO week. A single binary search finds the starts of all the years, rather than looking
+    # up each of the dates. Then a 2-D index array - a column of week offsets plus a row of year starts - gathers all
+    # the slices side by side in one go, to be put into the dataframe at once, rather than inserting a column per year.
+    dates_all = df_morta_country_all['date'].to_numpy()
+    deaths_all = df_morta_country_all['deaths'].to_numpy()
+
+    year_starts = np.array([pd.Timestamp.fromisocalendar(y, 1, 7).to_datetime64()
+                            for y in range(morta_year_all_min, morta_year_all_max + 1)])
+
+    weeks_idx = np.arange(len(dates_weekly_one))[:, np.newaxis] + np.searchsorted(dates_all, year_starts)
+
+    assert weeks_idx[-1, -1] < len(deaths_all), \
+        "The all-time weekly dates end before the last of {} weeks from the 1st ISO week of {}.".format(
+            len(dates_weekly_one), morta_year_all_max)
+
+    df_morta_country_one[morta_death_cols_all] = deaths_all[weeks_idx]
 
-    return df_morta_country_all, df_morta_country_one
+    return df_morta_country_one
 
 
-def process_covid_df(df_covid_country, df_dates_weekly_one, time_unit, if_interpolate):
+def process_covid_df(df_covid_country, time_unit, if_interpolate):
 
     if if_interpolate:
         # Fill any NaN values with interpolation between the 2 known closest values. Zeros are treated as real data and
         # left intact. Eg. vaccination counts and stringency index data are notoriously missing, Mexico and Ecuador had
         # single missing records of 'new_deaths' at d2e597487d etc.
-        df_covid_country['people_vaccinated'].interpolate(limit_area='inside', inplace=True)
-        df_covid_country['people_fully_vaccinated'].interpolate(limit_area='inside', inplace=True)
-        df_covid_country['total_boosters'].interpolate(limit_area='inside', inplace=True)
-        df_covid_country['stringency_index'].interpolate(limit_area='inside', inplace=True)
-        df_covid_country['new_cases_smoothed'].interpolate(limit_area='inside', inplace=True)
-        df_covid_country['new_tests_smoothed'].interpolate(limit_area='inside', inplace=True)
-        df_covid_country['new_deaths'].interpolate(limit_area='inside', inplace=True)
+        cols = ['people_vaccinated', 'people_fully_vaccinated', 'total_boosters', 'stringency_index',
+                'new_cases_smoothed', 'new_tests_smoothed', 'new_deaths']
+        df_covid_country[cols] = interpolate_inside(df_covid_country[cols])
 
     # NOTE: OWID's positive_rate multiplied by 100 usually equals my positive_test_percent. However, there are
     # countries for which OWID derive positive_rate in a different way than "JHU cases divided by OWID tests". As of
@@ -233,36 +369,55 @@ def process_covid_df(df_covid_country, df_dates_weekly_one, time_unit, if_interp
     #  TODO: Decide whether to use OWID's `positive_rate * 100`, or to stick with `new_cases_smoothed /
     #   new_tests_smoothed * 100`. For now I'll go with the latter, as it allows me to easily spot countries whose cases
     #   or tests count are weird - like Brazil.
-    df_covid_country['positive_test_percent'] = \
-        df_covid_country['new_cases_smoothed'] / df_covid_country['new_tests_smoothed'] * 100
-
-    df_covid_country['people_vaccinated_percent'] = \
-        df_covid_country['people_vaccinated'] / df_covid_country['population'] * 100
-
-    df_covid_country['people_fully_vaccinated_percent'] = \
-        df_covid_country['people_fully_vaccinated'] / df_covid_country['population'] * 100
-
-    df_covid_country['total_boosters_percent'] = \
-        df_covid_country['total_boosters'] / df_covid_country['population'] * 100
-
-    # Resample the daily covid data to match the weekly mortality data, with week date on Sunday. resample().sum()
-    # removes any input non-numeric columns, ie. `location` here, but we don't need it. It also "hides" the `date`
-    # column by setting an index on it, but we are going to need this column later on, thus bringing it back with
-    # reset_index().
-    df_covid_country_all = df_covid_country.resample(rule='W', on='date').agg(
-        {'new_deaths': lambda x: x.sum(min_count=1),
-         'new_cases_smoothed': lambda x: x.sum(min_count=1),
-         'new_tests_smoothed': lambda x: x.sum(min_count=1),
-         'positive_test_percent': 'mean',
-         'stringency_index': 'mean',
-         'people_vaccinated': 'mean',
-         'people_fully_vaccinated': 'mean',
-         'total_boosters': 'mean',
-         'people_vaccinated_percent': 'mean',
-         'people_fully_vaccinated_percent': 'mean',
-         'total_boosters_percent': 'mean',
-         'population': 'mean'}
-    ).reset_index()
+    #
+    # OWID's population of a country is the same on each day. So it's taken once, as a scalar to divide by, rather than
+    # dividing by the whole column, and aggregating it into weeks along with the rest.
+    #
+    # All 4 percentages are computed at once, dividing a 2-D array of their numerators by one of their denominators,
+    # rather than with a separate division and multiplication for each. Division by zero tests gives inf, as with
+    # pandas, just without numpy warning about it.
+    population = df_covid_country['population'].max()
+
+    numerators = df_covid_country[['new_cases_smoothed', 'people_vaccinated', 'people_fully_vaccinated',
+                                   'total_boosters']].to_numpy()
+
+    denominators = np.empty_like(numerators)
+    denominators[:, 0] = df_covid_country['new_tests_smoothed'].to_numpy()
+    denominators[:, 1:] = population
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percents = numerators / denominators
+
+    percents *= 100
+
+    df_covid_country[['positive_test_percent', 'people_vaccinated_percent', 'people_fully_vaccinated_percent',
+                      'total_boosters_percent']] = percents
+
+    # Aggregate the daily covid data into weeks, to match the weekly mortality data, with week date on Sunday. Same as
+    # resample(rule='W', on='date') would do, but grouping on the week-ending Sunday of each day directly is cheaper
+    # than going through the resampler machinery. NOTE: Flooring the dates with astype('datetime64[W]') would be wrong,
+    # as numpy weeks start on Thursdays. Columns not aggregated, ie. `location` here, are dropped, but we don't need it.
+    # The `date` index is kept, as the weekly rows of the year being charted are later picked by it.
+    dates_daily = df_covid_country['date']
+    dates_weekly = dates_daily + pd.to_timedelta((6 - dates_daily.dt.dayofweek) % 7, unit='D')
+
+    # Counts are summed up and the rest averaged, each with a single built-in reduction over all their columns, rather
+    # than calling back a Python lambda for each week and column. min_count=1 makes weeks with no records at all NaN,
+    # rather than 0.
+    weeks = df_covid_country.groupby(dates_weekly.rename('date'), sort=False)
+
+    df_covid_country_all = pd.concat(
+        [weeks[['new_deaths', 'new_cases_smoothed', 'new_tests_smoothed']].sum(min_count=1),
+         weeks[['positive_test_percent', 'stringency_index', 'people_vaccinated', 'people_fully_vaccinated',
+                'total_boosters', 'people_vaccinated_percent', 'people_fully_vaccinated_percent',
+                'total_boosters_percent']].mean()],
+        axis='columns')
+
+    df_covid_country_all['population'] = population
+
+    # Unlike resample(), groupby() has no rows for the weeks without any daily records. Bring them back as NaN.
+    df_covid_country_all = df_covid_country_all.reindex(
+        pd.date_range(start=dates_weekly.min(), end=dates_weekly.max(), freq='W', name='date'))
 
     if if_interpolate:
         # Interpolate again - now between the weekly values. Due to possible (although very rare) time interval
@@ -271,82 +426,172 @@ def process_covid_df(df_covid_country, df_dates_weekly_one, time_unit, if_interp
         # https://github.com/owid/covid-19-data/issues/2258). There was a similar problem with Estonia, Greece and
         # Latvia at that time. I haven't actually observed such issues with data series other than 'stringency index',
         # but let's interpolate them away as well, just in case. This won't do harm - if they don't have NaN records,
-        # interpolation will just leave them intact.
-        df_covid_country_all['people_vaccinated'].interpolate(limit_area='inside', inplace=True)
-        df_covid_country_all['people_fully_vaccinated'].interpolate(limit_area='inside', inplace=True)
-        df_covid_country_all['total_boosters'].interpolate(limit_area='inside', inplace=True)
-        df_covid_country_all['people_vaccinated_percent'].interpolate(limit_area='inside', inplace=True)
-        df_covid_country_all['people_fully_vaccinated_percent'].interpolate(limit_area='inside', inplace=True)
-        df_covid_country_all['total_boosters_percent'].interpolate(limit_area='inside', inplace=True)
-        df_covid_country_all['stringency_index'].interpolate(limit_area='inside', inplace=True)
-        df_covid_country_all['new_cases_smoothed'].interpolate(limit_area='inside', inplace=True)
-        df_covid_country_all['new_tests_smoothed'].interpolate(limit_area='inside', inplace=True)
-        df_covid_country_all['positive_test_percent'].interpolate(limit_area='inside', inplace=True)
-        df_covid_country_all['new_deaths'].interpolate(limit_area='inside', inplace=True)
+        # interpolation will just leave them intact. And if none of them has any, it's skipped altogether, after a
+        # single check of all the columns at once.
+        cols = ['people_vaccinated', 'people_fully_vaccinated', 'total_boosters', 'people_vaccinated_percent',
+                'people_fully_vaccinated_percent', 'total_boosters_percent', 'stringency_index', 'new_cases_smoothed',
+                'new_tests_smoothed', 'positive_test_percent', 'new_deaths']
+        values_weekly = df_covid_country_all[cols].to_numpy()
+
+        if np.isnan(values_weekly).any():
+            df_covid_country_all[cols] = interpolate_inside(values_weekly)
 
     # If all-cause mortality data resolution is monthly, we need to adjust daily covid mortality data accordingly.
-    # TODO: Come up with something neater than this 'temp' name.
     if time_unit == 'monthly':
-        temp = df_covid_country.resample(rule='M', on='date').agg({'new_deaths': lambda x: x.sum(min_count=1)}). \
-            resample(rule='W').first(). \
-            interpolate(limit_area='inside').reset_index()
+        new_deaths_monthly = df_covid_country.resample(rule='M', on='date')['new_deaths'].sum(min_count=1)
+
+        # Up-sample the daily->monthly covid mortality data to df_covid_country_all's weekly date index, and replace
+        # 'new_deaths' there with daily->monthly->weekly data.
+        df_covid_country_all['new_deaths'] = monthly_to_weekly(new_deaths_monthly.index, new_deaths_monthly,
+                                                               df_covid_country_all.index)
+
+    return df_covid_country_all
+
+
+# Fill NaN values lying between known ones by linear interpolation, same as Series.interpolate(limit_area='inside')
+# does, but in numpy rather than through pandas' generic interpolation machinery. Takes a single column, or several at
+# once as a dataframe or 2-D array, so that they are all taken out of and put back into the dataframe in one go.
+def interpolate_inside(values):
+    values = np.asarray(values).copy()
+
+    # Columns of a 2-D array are views, so filling them fills `values`.
+    for column in (values[:, np.newaxis] if values.ndim == 1 else values).T:
+        notnull_idx = np.flatnonzero(~np.isnan(column))
+
+        if len(notnull_idx) < 2:
+            continue
+
+        inside_idx = np.flatnonzero(np.isnan(column[notnull_idx[0]:notnull_idx[-1]])) + notnull_idx[0]
+
+        column[inside_idx] = np.interp(inside_idx, notnull_idx, column[notnull_idx])
+
+    return values
 
-        # Align the up-sampled daily->monthly->weekly covid mortality data with the df_covid_country_all's date index,
-        # and replace 'new_deaths' there with daily->monthly->weekly data.
-        df_covid_country_all['new_deaths'] = pd.merge(
-            left=df_covid_country_all[['date']], right=temp, on='date', how='left')['new_deaths']
 
-    # Take only rows of the year specified on command line.
-    df_covid_country_one = pd.merge(left=df_dates_weekly_one, right=df_covid_country_all, on='date', how='left')
+# Up-sample monthly data to the weekly dates given. Same as resample(rule='W').first().interpolate(limit_area='inside')
+# would do, i.e. with each month's value put at the end of the week the month ends in and linear interpolation between
+# them, but in a single numpy pass rather than through pandas' resampling machinery.
+def monthly_to_weekly(dates_monthly, values_monthly, dates_weekly):
+    dates_monthly = pd.DatetimeIndex(dates_monthly)
+    values_monthly = np.asarray(values_monthly, dtype='float64')
 
-    return df_covid_country_all, df_covid_country_one
+    # Sundays ending the weeks the months end in.
+    sundays_monthly = dates_monthly + pd.to_timedelta((6 - dates_monthly.dayofweek) % 7, unit='D')
+
+    notnull = ~np.isnan(values_monthly)
+
+    if not notnull.any():
+        return np.full(len(dates_weekly), np.nan)
+
+    return np.interp(pd.DatetimeIndex(dates_weekly).asi8, sundays_monthly.asi8[notnull], values_monthly[notnull],
+                     left=np.nan, right=np.nan)
 
 
 def merge_covid_morta_dfs(df_covid_country_one, df_morta_country, year, morta_death_cols_bgd):
-    # Merge both datasets now that they are complete and aligned on same dates.
-    df_merge_country_one = pd.merge(df_morta_country, df_covid_country_one, how='inner')
+    # Merge both datasets now that they are complete and aligned on same dates. Aligning them on their date index is
+    # enough for that, no need for a full-blown merge.
+    df_merge_country_one = pd.concat([df_morta_country.set_index('date'), df_covid_country_one],
+                                     axis='columns').reset_index()
+
+    # Reduce the background years' death counts of each week all from the same numpy array, rather than slicing the
+    # dataframe for each reduction. NaNs are skipped, like pandas does. Weeks with no background data at all are NaN,
+    # without numpy warning about it.
+    deaths_bgd = df_merge_country_one[morta_death_cols_bgd].to_numpy()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
 
-    df_merge_country_one['deaths_min'] = df_merge_country_one[morta_death_cols_bgd].min(axis='columns')
-    df_merge_country_one['deaths_max'] = df_merge_country_one[morta_death_cols_bgd].max(axis='columns')
-    df_merge_country_one['deaths_mean'] = df_merge_country_one[morta_death_cols_bgd].mean(axis='columns')
+        df_merge_country_one['deaths_min'] = np.nanmin(deaths_bgd, axis=1)
+        df_merge_country_one['deaths_max'] = np.nanmax(deaths_bgd, axis=1)
+        df_merge_country_one['deaths_mean'] = np.nanmean(deaths_bgd, axis=1)
 
     # NOTE: At certain dates, for some countries, one-off upstream corrections in covid mortality counts sometimes
     # happen, leading to over- or under-shoots in deaths_noncovid - https://github.com/owid/covid-19-data/issues/1550.
-    df_merge_country_one['deaths_noncovid'] = df_merge_country_one['deaths_{}_all_ages'.format(str(year))].sub(
-        df_merge_country_one['new_deaths'], fill_value=None)
+    # Both columns are of the same rows already, so plain numpy subtraction does, with no index alignment.
+    deaths_year = df_merge_country_one['deaths_{}_all_ages'.format(str(year))].to_numpy()
+    df_merge_country_one['deaths_noncovid'] = deaths_year - df_merge_country_one['new_deaths'].to_numpy()
+
+    # Rounded to 3 decimals for the output. All the float columns are taken out as one new array, rounded in place, and
+    # put back at once - rather than rounding the whole dataframe into a full copy of it. Other columns have nothing
+    # to round.
+    cols_float = df_merge_country_one.select_dtypes('floating').columns
+    values_float = df_merge_country_one[cols_float].to_numpy(dtype='float64', copy=True)
+
+    np.round(values_float, decimals=3, out=values_float)
+
+    df_merge_country_one[cols_float] = values_float
+
+    return df_merge_country_one
+
 
-    return df_merge_country_one.round(decimals=3)
+# Creating a new matplotlib figure, with all its axes, ticks, spines etc., for each chart is expensive. So each process
+# creates just one, on first use, and then only clears its axes before drawing each next chart on them.
+figure = None
+
+
+def get_figure():
+    global figure
+
+    if figure is None:
+        fig, axs = mpyplot.subplots(figsize=(13.55, 5.75))  # Create an empty matplotlib figure and axes.
+
+        axs2 = axs.twinx()
+
+        # Leave room for the rotated date labels of the X axis.
+        fig.subplots_adjust(bottom=0.2)
+
+        fig.text(0.065, 0,
+                 "This chart was downloaded from https://github.com/czka/covid_toll_tool.\n"
+                 "Chart's data source is OWID (Our World in Data), https://github.com/owid/covid-19-data.\n"
+                 "For more information about the data presented on this chart please see "
+                 "https://github.com/czka/covid_toll_tool/blob/main/README.md.",
+                 fontsize=9, va="bottom", ha="left", linespacing=1.5, fontstyle='italic')
+
+        figure = fig, axs, axs2
+
+    else:
+        fig, axs, axs2 = figure
+
+        axs.clear()
+        axs2.clear()
+
+        # Clearing doesn't retain this bit of the right Y axis's twinx() setup.
+        axs2.yaxis.set_label_position('right')
+
+    return figure
 
 
-# TODO: Watch out for the status of 'x_compat'. It's not documented where I'd expect to be [1] although mentioned few
-#  times in [2]. If it's going to be depreciated, a workaround will be needed as e.g. per [3], [4].
-# [1]https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.plot.html
-# [2]https://pandas.pydata.org/pandas-docs/stable/user_guide/visualization.html
-# [3]https://stackoverflow.com/questions/12945971/pandas-timeseries-plot-setting-x-axis-major-and-minor-ticks-and-labels
-# [4]https://stackoverflow.com/questions/30133280/pandas-bar-plot-changes-date-format
 def plot_weekly(df_merge_country_one, country, year, morta_year_bgd_notnull_min, morta_year_bgd_notnull_max, time_unit,
-                y_min, y_max):
+                y_min, y_max, if_fast_png):
+
+    fig, axs, axs2 = get_figure()
 
-    fig, axs = mpyplot.subplots(figsize=(13.55, 5.75))  # Create an empty matplotlib figure and axes.
+    # The dates are needed by each line and by the X axis limits. Taken out of the dataframe once, for all of them.
+    dates = df_merge_country_one['date'].to_numpy()
 
-    axs2 = axs.twinx()
+    # Plotting straight with matplotlib, rather than with DataFrame.plot(), which re-does a lot of its own setup of the
+    # axes on each call, only for it to be overridden below anyway.
+    for col, color, style in zip(['deaths_min', 'deaths_mean', 'deaths_max', 'deaths_{}_all_ages'.format(str(year)),
+                                  'deaths_noncovid'],
+                                 ['deepskyblue', 'dimgrey', 'tab:red', 'black', 'black'],
+                                 [':', ':', ':', '-', '--']):
+        axs.plot(dates, df_merge_country_one[col], style, color=color)
 
-    df_merge_country_one.plot(x_compat=True, kind='line', use_index=True, grid=True, rot=50,
-                              color=['deepskyblue', 'dimgrey', 'tab:red', 'black', 'black'],
-                              style=[':', ':', ':', '-', '--'],
-                              ax=axs, x='date', y=['deaths_min', 'deaths_mean', 'deaths_max',
-                                                   'deaths_{}_all_ages'.format(str(year)), 'deaths_noncovid'])
+    for col, color, style in zip(['stringency_index', 'positive_test_percent', 'people_vaccinated_percent',
+                                  'people_fully_vaccinated_percent', 'total_boosters_percent'],
+                                 ['fuchsia', 'cornflowerblue', 'mediumspringgreen', 'mediumspringgreen',
+                                  'mediumspringgreen'],
+                                 ['-', '-', '--', '-', '-.']):
+        axs2.plot(dates, df_merge_country_one[col], style, color=color)
 
-    df_merge_country_one.plot(x_compat=True, kind='line', use_index=True, grid=False, rot=50,
-                              color=['fuchsia', 'cornflowerblue', 'mediumspringgreen', 'mediumspringgreen',
-                                     'mediumspringgreen'],
-                              style=['-', '-', '--', '-', '-.'],
-                              ax=axs2, x='date', y=['stringency_index', 'positive_test_percent',
-                                                    'people_vaccinated_percent', 'people_fully_vaccinated_percent',
-                                                    'total_boosters_percent'])
+    axs.grid(True)
 
-    axs.fill_between(df_merge_country_one['date'], df_merge_country_one['deaths_min'],
-                     df_merge_country_one['deaths_max'], alpha=0.25, color='silver')
+    for label in axs.get_xticklabels():
+        label.set_horizontalalignment('right')
+        label.set_rotation(50)
+
+    axs.fill_between(dates, df_merge_country_one['deaths_min'], df_merge_country_one['deaths_max'], alpha=0.25,
+                     color='silver')
 
     axs.legend(['{} lowest death count in {}-{} from all causes'.format(
                     time_unit, morta_year_bgd_notnull_min, morta_year_bgd_notnull_max),
@@ -376,13 +621,13 @@ def plot_weekly(df_merge_country_one, country, year, morta_year_bgd_notnull_min,
     axs.set_xlabel(xlabel="date (ISO week Sunday)", loc="right")
 
     axs2.set(ylabel="percent",
-             xlim=[df_merge_country_one['date'].to_list()[0], df_merge_country_one['date'].to_list()[-1]],
+             xlim=[dates[0], dates[-1]],
              ylim=[-0.25, 100.5])
 
     axs2.yaxis.set_major_locator(mticker.MultipleLocator(10))
 
     axs.set(ylabel="count",
-            xlim=[df_merge_country_one['date'].to_list()[0], df_merge_country_one['date'].to_list()[-1]],
+            xlim=[dates[0], dates[-1]],
             ylim=[y_min - (abs(y_max) - abs(y_min)) * 0.05, y_max + (abs(y_max) - abs(y_min)) * 0.05])
 
     axs2.set_xlabel(xlabel="date (ISO week Sunday)", loc="right")
@@ -395,28 +640,29 @@ def plot_weekly(df_merge_country_one, country, year, morta_year_bgd_notnull_min,
 
     axs.xaxis.set_major_formatter(mdates.DateFormatter('%d.%m'))
 
-    mpyplot.title("{}, {}".format(country, year), fontweight="bold", loc='right')
-
-    mpyplot.figtext(0.065, 0,
-                    "This chart was downloaded from https://github.com/czka/covid_toll_tool.\n"
-                    "Chart's data source is OWID (Our World in Data), https://github.com/owid/covid-19-data.\n"
-                    "For more information about the data presented on this chart please see "
-                    "https://github.com/czka/covid_toll_tool/blob/main/README.md.",
-                    fontsize=9, va="bottom", ha="left", linespacing=1.5, fontstyle='italic')
+    axs2.set_title("{}, {}".format(country, year), fontweight="bold", loc='right')
 
     # mpyplot.tight_layout(pad=1)
 
-    fig.savefig('{}_{}.png'.format(country.replace(' ', '_'), year), bbox_inches="tight", pad_inches=0.05,
-                pil_kwargs={'optimize': True})
+    # Both the PNG chart and the CSV dataset are named after the country and year.
+    file_name_stem = '{}_{}'.format(country.replace(' ', '_'), year)
 
-    df_merge_country_one.to_csv('{}_{}.csv'.format(country.replace(' ', '_'), year), index=False)
+    # A fast, low zlib compression level. PIL's 'optimize' (level 9 plus a search for the best filter) used to be the
+    # single slowest step in rendering a chart, for no meaningful gain in file size on charts like these. Level 3 is
+    # nearly as fast as level 1, with a few percent smaller files - and both faster and smaller than zlib's default 6.
+    # Level 1 is for when speed is all that matters. DPI is set explicitly, so that the chart's size in pixels doesn't
+    # depend on the matplotlib configuration.
+    fig.savefig(file_name_stem + '.png', dpi=100, bbox_inches="tight", pad_inches=0.05,
+                pil_kwargs={'compress_level': 1 if if_fast_png else 3})
+
+    df_merge_country_one.to_csv(file_name_stem + '.csv', index=False)
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(
         add_help=False,
         description=__doc__,
-        epilog="The output are a PNG chart and CSV dataset for the '--country' and the '--year' specified on the "
+        epilog="The output are a PNG chart and CSV dataset for the '--country' and each '--year' specified on the "
                "command line - e.g. 'Poland_2020.png' and 'Poland_2020.csv'.")
 
     parser._optionals.title = 'Arguments'
@@ -435,7 +681,10 @@ if __name__ == '__main__':
     parser.add_argument('--year',
                         required='--country' in sys.argv,
                         type=int,
-                        help="Year to process - e.g. '2020'.")
+                        nargs='+',
+                        dest='years',
+                        help="Year to process - e.g. '2020'. Give more years, e.g. '2020 2021 2022', to process them "
+                             "all in one go, which is faster than one by one.")
 
     parser.add_argument('--interpolate',
                         action='store_true',
@@ -446,10 +695,17 @@ if __name__ == '__main__':
                              'of a more complete chart, but at a cost of a less accurate representation of some of the '
                              'input data. By default interpolation is disabled.')
 
+    parser.add_argument('--fast_png',
+                        action='store_true',
+                        dest='if_fast_png',
+                        default=False,
+                        help='Save PNG charts with the fastest compression, at a cost of a few percent larger files. '
+                             'Handy for quick previews.')
+
     parser.add_argument('--help', '-h',
                         action='help',
                         help='Show this help message.')
 
     args = parser.parse_args()
 
-    main(args.country, args.year, args.if_list_countries, args.if_interpolate)
+    main(args.country, args.years, args.if_list_countries, args.if_interpolate, args.if_fast_png)